@@ -27,9 +27,12 @@ async def get_travel_recommendations(request: TravelRecommendationRequest):
             sigungu_code=sigungu_code,
             category_codes=request.category_codes,
             days=request.days,
+            time_budget_ms=request.time_budget_ms,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -44,6 +44,7 @@ class TravelSchedule(BaseModel):
     schedule: dict[str, DailySchedule]
     message: str
     area_code: str
+    truncated_stages: List[str] = Field(default_factory=list, description="시간 예산 초과로 중간 결과를 사용한 단계 목록")
 
 class CategoryHierarchy(BaseModel):
     category_code: str
@@ -56,4 +57,5 @@ class TravelRecommendationRequest(BaseModel):
     sigungu_code: Optional[str] = Field(None, description="시군구 코드 (예: 강남구-1, 전체-None)gi")
     category_codes: List[str] = Field(..., description="카테고리 코드 목록 (예: ['A01', 'A05'])")
     days: int = Field(..., ge=1, le=7, description="여행 일수 (1-7일)")
+    time_budget_ms: Optional[int] = Field(None, ge=100, le=60000, description="계획 시간 예산 (ms, 미지정 시 서버 기본값)")
     
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn
 from dotenv import load_dotenv
@@ -45,6 +45,23 @@ class Settings(BaseSettings):
     RESTAURANT_RATIO: float = 0.3  # 하루 일정 중 음식점 비율
     MAX_DISTANCE: float = 50.0  # 최대 이동 거리 (km)
     
+    # 계획 시간 예산 설정
+    PLANNING_TIME_BUDGET_MS: int = 3000  # 요청당 기본 계획 시간 예산 (ms)
+    PLANNING_STAGE_RATIOS: Dict[str, float] = {  # 단계별 예산 비율
+        "fetch": 0.4,
+        "clustering": 0.3,
+        "route": 0.1,
+        "accommodation": 0.2,
+    }
+    FETCH_BATCH_SIZE: int = 500  # 여행지 조회 시 한 번에 받을 행 수
+    CLUSTERING_MAX_RESTARTS: int = 5  # 예산 내 K-means 최대 재시작 횟수
+    
+    # 사전 계산 설정
+    PRECOMPUTE_ENABLED: bool = True  # 사전 계산 결과 사용 여부
+    PRECOMPUTE_DIR: str = "precomputed"  # 사전 계산 파일 디렉토리
+    PRECOMPUTE_NEAREST_LIMIT: int = 10  # 클러스터별 저장할 가까운 음식점/숙소 수
+    PRECOMPUTE_SPOTS_PER_DAY: int = 5  # 사전 계산 결과에서 추출할 하루 관광지 수
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
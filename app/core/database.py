@@ -23,4 +23,8 @@ def get_db_cursor():
         return conn.cursor()
     except Exception as e:
         conn.close()
-        raise Exception(f"커서 생성 실패: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"커서 생성 실패: {str(e)}") 
+
+def set_statement_timeout(cursor, timeout_ms: float) -> None:
+    """현재 트랜잭션의 statement_timeout을 설정합니다 (0은 무제한이므로 최소 1ms)."""
+    cursor.execute("SET LOCAL statement_timeout = %s", (max(1, int(timeout_ms)),))
@@ -4,11 +4,14 @@
 
 from typing import List
 
+# 추천 대상에서 제외하는 음식점 카테고리 (카페, 클럽)
+EXCLUDED_RESTAURANT_CODES = ('A05020900', 'A05021000')
+
 def get_tourist_spots_query(category_patterns: List[str], include_sigungu:bool) -> str:
     """관광지와 음식점 데이터를 가져오는 쿼리"""
     like_conditions = " OR ".join(["c.category_code LIKE %s" for _ in category_patterns])
     sigungu_condition = "AND a.sigungu_code = %s" if include_sigungu else ""
-    # 음식점에서 'A05020900'과 'A05021000'은 제외 (카페,클럽)
+    excluded_codes = ", ".join(f"'{code}'" for code in EXCLUDED_RESTAURANT_CODES)
     return f"""
         SELECT 
             d.destination_id,
@@ -31,7 +34,7 @@ def get_tourist_spots_query(category_patterns: List[str], include_sigungu:bool)
         {sigungu_condition}
         AND ({like_conditions}
             OR c.category_code LIKE 'A0502%%'
-            AND c.category_code NOT IN ('A05020900', 'A05021000') 
+            AND c.category_code NOT IN ({excluded_codes}) 
             )
         AND d.latitude IS NOT NULL 
         AND d.longitude IS NOT NULL
@@ -59,4 +62,69 @@ def get_accommodations_query() -> str:
         AND d.longitude IS NOT NULL
         ORDER BY RANDOM()
         LIMIT 5;
-    """ 
\ No newline at end of file
+    """ 
+
+def get_regions_query() -> str:
+    """여행지가 있는 지역/시군구 코드 목록을 가져오는 쿼리"""
+    return """
+        SELECT DISTINCT
+            a.area_code,
+            a.sigungu_code
+        FROM destination d
+        JOIN address a ON d.address_id = a.address_id
+        WHERE a.area_code IS NOT NULL
+        AND d.latitude IS NOT NULL 
+        AND d.longitude IS NOT NULL
+        ORDER BY a.area_code, a.sigungu_code;
+    """
+
+def get_region_candidates_query(include_sigungu: bool) -> str:
+    """사전 계산용으로 지역 내 숙소를 제외한 모든 여행지를 가져오는 쿼리"""
+    sigungu_condition = "AND a.sigungu_code = %s" if include_sigungu else ""
+    return f"""
+        SELECT 
+            d.destination_id,
+            d.name,
+            d.addr1,
+            d.addr2,
+            d.latitude,
+            d.longitude,
+            d.content_id,
+            c.category_code,
+            c.name as category_name,
+            CASE 
+                WHEN c.category_code LIKE 'A05%%' THEN 'restaurant'
+                ELSE 'tourist_spot'
+            END as type
+        FROM destination d
+        JOIN category c ON d.category_id = c.category_id
+        JOIN address a ON d.address_id = a.address_id
+        WHERE a.area_code = %s
+        {sigungu_condition}
+        AND c.category_code NOT LIKE 'B02%%'
+        AND d.latitude IS NOT NULL 
+        AND d.longitude IS NOT NULL
+        ORDER BY d.destination_id;
+    """
+
+def get_region_accommodations_query() -> str:
+    """사전 계산용으로 시군구 내 모든 숙소를 가져오는 쿼리"""
+    return """
+        SELECT 
+            d.destination_id,
+            d.name,
+            d.addr1,
+            d.addr2,
+            d.latitude,
+            d.longitude,
+            d.content_id
+        FROM destination d
+        JOIN category c ON d.category_id = c.category_id
+        JOIN address a ON d.address_id = a.address_id
+        WHERE a.area_code = %s
+        AND a.sigungu_code = %s
+        AND c.category_code LIKE 'B02%%'
+        AND d.latitude IS NOT NULL 
+        AND d.longitude IS NOT NULL
+        ORDER BY d.destination_id;
+    """
\ No newline at end of file
@@ -0,0 +1,376 @@
+"""
+지역별 여행 일정 구성 요소 사전 계산
+
+(area_code, sigungu_code, days) 단위로 일자별 클러스터(최근접 이웃 순서로 정렬),
+클러스터에 배정된 음식점, 가까운 숙소 목록을 미리 계산해 gzip JSON 파일로 저장합니다.
+온라인 요청은 카테고리로 걸러낸 뒤 표본을 추출해 그 표본의 방문 순서만 최적화하고,
+사전 계산 결과가 없으면 실시간 계산으로 넘어갑니다.
+
+실행:
+    python -m app.services.precompute [--area-code 32] [--output-dir precomputed]
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.utils.distance import haversine, haversine_many
+from app.utils.clustering import cluster_spots_by_day, optimize_cluster_order, improve_route, interleave_spots
+from app.core.database import get_db_cursor
+from app.core.config import settings
+from app.api.v1.schemas.recommendations import TravelSpot, Accommodation
+from app.db.queries import (
+    EXCLUDED_RESTAURANT_CODES,
+    get_regions_query,
+    get_region_candidates_query,
+    get_region_accommodations_query,
+)
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 2
+
+# 압축 저장용 필드 순서
+SPOT_FIELDS = (
+    "destination_id", "name", "addr1", "addr2", "latitude", "longitude",
+    "content_id", "category_code", "category_name", "type",
+)
+ACCOMMODATION_FIELDS = (
+    "destination_id", "name", "addr1", "addr2", "latitude", "longitude", "content_id",
+)
+
+def _is_valid_code(code: str) -> bool:
+    # 파일 이름에 들어가므로 ASCII 영숫자만 허용 ('/', '..' 등으로 디렉토리를 벗어나지 않도록)
+    return code.isascii() and code.isalnum()
+
+def get_artifact_path(area_code: str, sigungu_code: Optional[str], output_dir: Optional[str] = None) -> Path:
+    """
+    지역별 사전 계산 파일 경로 (시군구가 없으면 지역 전체)
+
+    Raises:
+        ValueError: 코드가 영숫자가 아니거나 경로가 저장 디렉토리를 벗어나는 경우
+    """
+    if not _is_valid_code(area_code) or (sigungu_code is not None and not _is_valid_code(sigungu_code)):
+        raise ValueError(f"사전 계산 파일에 사용할 수 없는 지역 코드: area={area_code!r}, sigungu={sigungu_code!r}")
+    base_dir = Path(output_dir or settings.PRECOMPUTE_DIR).resolve()
+    path = (base_dir / f"{area_code}_{sigungu_code or 'all'}.json.gz").resolve()
+    if path.parent != base_dir:
+        raise ValueError(f"사전 계산 디렉토리를 벗어나는 경로: {path}")
+    return path
+
+def _row_to_record(row: Dict, fields) -> List:
+    # 실시간 경로의 TravelSpot/Accommodation 변환과 동일한 규칙
+    converters = {
+        "destination_id": str,
+        "addr1": lambda value: value or "",
+        "latitude": float,
+        "longitude": float,
+        "content_id": str,
+        "category_code": str,
+    }
+    return [converters.get(field, lambda value: value)(row[field]) for field in fields]
+
+def _nearest_indices(center_lat: float, center_lon: float, coords: np.ndarray, limit: int) -> List[int]:
+    """중심점에서 가까운 순으로 좌표 인덱스를 반환합니다."""
+    if len(coords) == 0:
+        return []
+    distances = haversine_many(center_lat, center_lon, coords[:, 0], coords[:, 1])
+    return [int(i) for i in np.argsort(distances, kind="stable")[:limit]]
+
+def _nearest_neighbour_order(coords: np.ndarray) -> List[int]:
+    """optimize_cluster_order와 같은 최근접 이웃 순서를 벡터 연산으로 계산합니다."""
+    remaining = np.ones(len(coords), dtype=bool)
+    current = 0
+    order = [current]
+    remaining[current] = False
+    for _ in range(len(coords) - 1):
+        distances = haversine_many(coords[current, 0], coords[current, 1], coords[:, 0], coords[:, 1])
+        distances[~remaining] = np.inf
+        current = int(np.argmin(distances))
+        order.append(current)
+        remaining[current] = False
+    return order
+
+def build_region_artifact(
+    area_code: str,
+    sigungu_code: Optional[str],
+    candidates: List[Dict],
+    accommodations: List[Dict]
+) -> Optional[Dict]:
+    """
+    한 지역의 일수별 일정 구성 요소를 계산합니다.
+
+    Args:
+        area_code: 지역 코드
+        sigungu_code: 시군구 코드 (None이면 지역 전체)
+        candidates: 숙소를 제외한 여행지 조회 결과
+        accommodations: 숙소 조회 결과
+
+    Returns:
+        Optional[Dict]: 저장할 사전 계산 데이터 (관광지가 없으면 None)
+    """
+    spots, spot_records = [], []
+    for row in candidates:
+        try:
+            record = _row_to_record(row, SPOT_FIELDS)
+            spots.append(TravelSpot(**dict(zip(SPOT_FIELDS, record))))
+            spot_records.append(record)
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error processing spot: {row}, Error: {str(e)}")
+    accommodation_records = []
+    for row in accommodations:
+        try:
+            record = _row_to_record(row, ACCOMMODATION_FIELDS)
+            Accommodation(**dict(zip(ACCOMMODATION_FIELDS, record)))
+            accommodation_records.append(record)
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error processing accommodation: {row}, Error: {str(e)}")
+
+    index_of = {id(spot): i for i, spot in enumerate(spots)}
+    tourist_spots = [spot for spot in spots if spot.type != "restaurant"]
+    restaurant_indices = [i for i, spot in enumerate(spots) if spot.type == "restaurant"]
+    if not tourist_spots:
+        return None
+
+    restaurant_coords = np.array([[spots[i].latitude, spots[i].longitude] for i in restaurant_indices]).reshape(-1, 2)
+    lat_idx, lon_idx = ACCOMMODATION_FIELDS.index("latitude"), ACCOMMODATION_FIELDS.index("longitude")
+    accommodation_coords = np.array(
+        [[record[lat_idx], record[lon_idx]] for record in accommodation_records], dtype=float
+    ).reshape(-1, 2)
+
+    limit = settings.PRECOMPUTE_NEAREST_LIMIT
+    blocks = {}
+    for days in range(1, settings.MAX_TRAVEL_DAYS + 1):
+        cluster_spots, _ = cluster_spots_by_day(tourist_spots, [], days)
+        clusters = [cluster_spots[idx] for idx in range(days) if cluster_spots[idx]]
+        centroids = np.array([
+            [sum(spot.latitude for spot in cluster) / len(cluster), sum(spot.longitude for spot in cluster) / len(cluster)]
+            for cluster in clusters
+        ])
+
+        # 실시간 경로처럼 음식점마다 가장 가까운 클러스터 하나에만 배정 (일자 간 중복 방지)
+        assigned = [[] for _ in clusters]
+        if len(restaurant_coords):
+            distances = np.array([
+                haversine_many(lat, lon, restaurant_coords[:, 0], restaurant_coords[:, 1])
+                for lat, lon in centroids
+            ])
+            for restaurant_pos, cluster_pos in enumerate(np.argmin(distances, axis=0)):
+                assigned[cluster_pos].append(restaurant_pos)
+
+        day_blocks = []
+        for cluster_pos, cluster in enumerate(clusters):
+            center_lat, center_lon = centroids[cluster_pos]
+            # 방문 순서 최적화는 요청 시 표본에만 수행하고, 여기서는 최근접 이웃 순서로만 정렬
+            coords = np.array([[spot.latitude, spot.longitude] for spot in cluster])
+            members = [index_of[id(cluster[i])] for i in _nearest_neighbour_order(coords)]
+            own = assigned[cluster_pos]
+            nearest_own = _nearest_indices(center_lat, center_lon, restaurant_coords[own].reshape(-1, 2), limit)
+            day_blocks.append({
+                "members": members,
+                "restaurants": [restaurant_indices[own[i]] for i in nearest_own],
+                "accommodations": _nearest_indices(center_lat, center_lon, accommodation_coords, limit),
+            })
+        blocks[str(days)] = day_blocks
+
+    return {
+        "version": ARTIFACT_VERSION,
+        "area_code": area_code,
+        "sigungu_code": sigungu_code,
+        "spots": spot_records,
+        "accommodations": accommodation_records,
+        "blocks": blocks,
+    }
+
+def save_artifact(artifact: Dict, path: Path) -> None:
+    """임시 파일에 쓴 뒤 교체하여 읽는 쪽이 불완전한 파일을 보지 않도록 합니다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+# 파일 경로별 (수정 시각, 데이터). 재계산으로 수정 시각이 바뀌면 같은 항목을 교체하므로
+# 파일 수만큼만 메모리에 유지됨
+_artifact_cache: Dict[str, Tuple[int, Optional[Dict]]] = {}
+
+def _read_artifact(path: Path) -> Optional[Dict]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"사전 계산 파일 로드 실패: {path}, Error: {str(e)}")
+        return None
+    if (
+        not isinstance(artifact, dict)
+        or artifact.get("version") != ARTIFACT_VERSION
+        or not isinstance(artifact.get("blocks"), dict)
+        or not isinstance(artifact.get("spots"), list)
+        or not isinstance(artifact.get("accommodations"), list)
+    ):
+        logger.warning(f"사전 계산 파일 형식이 맞지 않아 무시합니다: {path}")
+        return None
+    return artifact
+
+def load_artifact(area_code: str, sigungu_code: Optional[str]) -> Optional[Dict]:
+    """지역별 사전 계산 데이터를 읽습니다. 파일이 없거나 코드가 올바르지 않으면 None을 반환합니다."""
+    try:
+        path = get_artifact_path(area_code, sigungu_code)
+        mtime_ns = path.stat().st_mtime_ns
+    except (ValueError, OSError):
+        return None
+
+    key = str(path)
+    cached = _artifact_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    artifact = _read_artifact(path)
+    _artifact_cache[key] = (mtime_ns, artifact)
+    return artifact
+
+def _matches_categories(spot: TravelSpot, category_codes: List[str]) -> bool:
+    # get_tourist_spots_query의 카테고리 조건과 동일
+    if any(spot.category_code.startswith(code) for code in category_codes):
+        return True
+    return (
+        spot.type == "restaurant"
+        and spot.category_code.startswith("A0502")
+        and spot.category_code not in EXCLUDED_RESTAURANT_CODES
+    )
+
+def plan_from_artifact(artifact: Dict, category_codes: List[str], days: int) -> Optional[Dict[str, Dict]]:
+    """
+    사전 계산 데이터에서 카테고리로 걸러낸 뒤 일자별 일정을 표본 추출합니다.
+
+    Args:
+        artifact: 지역별 사전 계산 데이터
+        category_codes: 카테고리 코드 목록
+        days: 여행 일수
+
+    Returns:
+        Optional[Dict[str, Dict]]: 일자별 여행지 및 숙박시설 (구성할 수 없는 날이 있으면 None)
+    """
+    day_blocks = artifact["blocks"].get(str(days))
+    if not day_blocks or len(day_blocks) < days:
+        return None
+
+    spots = {}
+    def spot_at(idx: int) -> TravelSpot:
+        if idx not in spots:
+            spots[idx] = TravelSpot(**dict(zip(SPOT_FIELDS, artifact["spots"][idx])))
+        return spots[idx]
+
+    final_schedule = {}
+    for day, block in enumerate(day_blocks, start=1):
+        members = [spot_at(i) for i in block["members"]]
+        members = [spot for spot in members if _matches_categories(spot, category_codes)]
+        if not members:
+            return None
+
+        # 관광지 표본 추출 후 표본만 방문 순서 최적화
+        count = min(settings.PRECOMPUTE_SPOTS_PER_DAY, len(members))
+        sampled = [members[i] for i in sorted(random.sample(range(len(members)), count))]
+        day_tourist_spots, _ = improve_route(optimize_cluster_order(sampled))
+
+        # 이 클러스터에 배정된 음식점 중에서 표본 추출
+        nearby_restaurants = [spot_at(i) for i in block["restaurants"]]
+        nearby_restaurants = [spot for spot in nearby_restaurants if _matches_categories(spot, category_codes)]
+        count = min(settings.MAX_RESTAURANTS_PER_DAY, len(nearby_restaurants))
+        day_restaurants = optimize_cluster_order(random.sample(nearby_restaurants, count))
+
+        day_spots = interleave_spots(day_tourist_spots, day_restaurants)
+
+        # 마지막 날을 제외하고 일정 중심에서 가장 가까운 숙소 선택
+        accommodation = None
+        if day < days and block["accommodations"]:
+            center_lat = sum(spot.latitude for spot in day_spots) / len(day_spots)
+            center_lon = sum(spot.longitude for spot in day_spots) / len(day_spots)
+            candidates = [
+                Accommodation(**dict(zip(ACCOMMODATION_FIELDS, artifact["accommodations"][i])))
+                for i in block["accommodations"]
+            ]
+            accommodation = min(
+                candidates,
+                key=lambda acc: haversine(center_lat, center_lon, acc.latitude, acc.longitude)
+            )
+
+        final_schedule[f"day_{day}"] = {
+            "spots": day_spots,
+            "accommodation": accommodation
+        }
+
+    return final_schedule
+
+def precompute_all(output_dir: Optional[str] = None, area_code: Optional[str] = None) -> int:
+    """
+    모든 지역/시군구의 사전 계산 파일을 생성합니다.
+
+    Args:
+        output_dir: 저장 디렉토리 (None이면 settings.PRECOMPUTE_DIR)
+        area_code: 지정하면 해당 지역만 계산
+
+    Returns:
+        int: 생성된 파일 수
+    """
+    cursor = get_db_cursor()
+    written = 0
+    try:
+        cursor.execute(get_regions_query())
+        regions = [
+            (str(row["area_code"]), str(row["sigungu_code"]) if row["sigungu_code"] is not None else None)
+            for row in cursor.fetchall()
+        ]
+        if area_code is not None:
+            regions = [region for region in regions if region[0] == area_code]
+
+        # 시군구별 파일과 함께 지역 전체(시군구 미지정) 파일도 생성
+        targets = sorted({(area, None) for area, _ in regions}, key=lambda r: r[0])
+        targets += [region for region in regions if region[1] is not None]
+
+        for area, sigungu in targets:
+            try:
+                path = get_artifact_path(area, sigungu, output_dir)
+            except ValueError as e:
+                logger.warning(f"건너뜀: {str(e)}")
+                continue
+
+            params = [area] if sigungu is None else [area, sigungu]
+            cursor.execute(get_region_candidates_query(sigungu is not None), params)
+            candidates = cursor.fetchall()
+
+            # 실시간 경로와 동일하게 숙소는 시군구 단위로만 추천
+            accommodations = []
+            if sigungu is not None:
+                cursor.execute(get_region_accommodations_query(), [area, sigungu])
+                accommodations = cursor.fetchall()
+
+            artifact = build_region_artifact(area, sigungu, candidates, accommodations)
+            if artifact is None:
+                logger.info(f"관광지가 없어 건너뜀: area={area}, sigungu={sigungu}")
+                continue
+
+            save_artifact(artifact, path)
+            written += 1
+            logger.info(f"사전 계산 완료: {path} ({len(candidates)} spots)")
+    finally:
+        cursor.close()
+
+    return written
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="지역별 여행 일정 구성 요소 사전 계산")
+    parser.add_argument("--output-dir", default=None, help="저장 디렉토리 (기본값: PRECOMPUTE_DIR)")
+    parser.add_argument("--area-code", default=None, help="특정 지역만 계산")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+    written = precompute_all(output_dir=args.output_dir, area_code=args.area_code)
+    logger.info(f"사전 계산 파일 {written}개 생성")
+
+if __name__ == "__main__":
+    main()
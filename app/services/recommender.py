@@ -1,8 +1,11 @@
 from typing import List, Dict, Optional
 import logging
+from psycopg2.errors import QueryCanceled
 from app.utils.distance import haversine
 from app.utils.clustering import optimize_schedule
-from app.core.database import get_db_cursor
+from app.utils.deadline import PlanningBudget
+from app.core.database import get_db_cursor, set_statement_timeout
+from app.services.precompute import load_artifact, plan_from_artifact
 from app.core.config import settings
 from app.api.v1.schemas.recommendations import TravelSpot, Accommodation, TravelStyle
 from app.db.queries import get_tourist_spots_query, get_accommodations_query
@@ -15,28 +18,53 @@ class TourAPIRecommender:
         area_code: str,
         sigungu_code: Optional[str],
         category_codes: List[str],
-        days: int
+        days: int,
+        time_budget_ms: Optional[int] = None
     ) -> Dict:
         """
         여행 일정 추천 API
         
+        사전 계산된 지역별 일정 구성 요소가 있으면 카테고리로 걸러 표본을 추출하고,
+        없으면 실시간으로 계산합니다.
+        실시간 계산에서는 조회, 클러스터링, 경로 개선, 숙소 추천 단계가 시간 예산을 나누어 쓰며,
+        각 단계는 예산이 소진되면 현재까지의 최선 결과를 반환합니다.
+        
         Args:
             area_code: 지역 코드 (예: 32-강원도)
             sigungu_code: 시군구 코드 (예: 1-강릉시)
             category_codes: 카테고리 코드 목록 (예: ['A01', 'A05', 'A02'])
             days: 여행 일수
+            time_budget_ms: 계획 시간 예산 (ms, None이면 settings.PLANNING_TIME_BUDGET_MS)
             
         Returns:
-            Dict: 일자별 추천 여행지 및 숙박시설
+            Dict: 일자별 추천 여행지 및 숙박시설, 중간 종료된 단계 목록
         """
+        budget = PlanningBudget(
+            time_budget_ms or settings.PLANNING_TIME_BUDGET_MS,
+            settings.PLANNING_STAGE_RATIOS
+        )
+        if not category_codes or len(category_codes) < 2:
+            raise ValueError("카테고리 코드를 두 개 이상 지정해주세요.")
+
+        # 0. 사전 계산된 일정 구성 요소가 있으면 사용 (없으면 실시간 계산)
+        if settings.PRECOMPUTE_ENABLED:
+            artifact = load_artifact(area_code, sigungu_code)
+            precomputed = plan_from_artifact(artifact, category_codes, days) if artifact else None
+            if precomputed is not None:
+                logger.info(f"Precomputed schedule used: area={area_code}, sigungu={sigungu_code}, days={days}")
+                return {
+                    "schedule": precomputed,
+                    "message": "여행 일정이 성공적으로 생성되었습니다.",
+                    "area_code": area_code,
+                    "truncated_stages": budget.truncated_stages
+                }
+
         cursor = get_db_cursor()
         
         try:
             # 1. 관광지와 음식점 데이터 가져오기
             # 시군구 코드가 None이면 전체 지역을 대상으로 함
             include_sigungu = sigungu_code is not None
-            if not category_codes or len(category_codes) < 2:
-                raise ValueError("카테고리 코드를 두 개 이상 지정해주세요.")
                 
             # 카테고리 코드 패턴 생성
             category_patterns = [f"{code}%" for code in category_codes]
@@ -50,8 +78,33 @@ class TourAPIRecommender:
             query_params += category_patterns
             logger.info(f"Query: {tourist_spots_query}")
             logger.info(f"Query parameters: {query_params}") 
-            cursor.execute(tourist_spots_query, query_params)
-            spots = cursor.fetchall()
+            # 서버 측 커서로 배치 단위로 받아 마감 시 받은 행까지만 사용
+            # (무작위 정렬이므로 앞쪽 일부도 무작위 표본)
+            fetch_deadline = budget.stage("fetch")
+            spots = []
+            spot_cursor = cursor.connection.cursor(name="tourist_spots")
+            try:
+                # 첫 배치는 정렬이 끝나야 나오므로 요청 전체의 남은 예산까지 허용
+                set_statement_timeout(cursor, budget.deadline.remaining_ms())
+                spot_cursor.execute(tourist_spots_query, query_params)
+                while True:
+                    batch = spot_cursor.fetchmany(settings.FETCH_BATCH_SIZE)
+                    spots.extend(batch)
+                    if len(batch) < settings.FETCH_BATCH_SIZE:
+                        break
+                    if fetch_deadline.expired():
+                        budget.mark_truncated("fetch")
+                        break
+                    set_statement_timeout(cursor, fetch_deadline.remaining_ms())
+            except QueryCanceled:
+                # 실패한 트랜잭션에서는 close가 CLOSE 문을 보내지 않음
+                spot_cursor.close()
+                cursor.connection.rollback()
+                if not spots:
+                    raise TimeoutError("여행지 조회 시간이 초과되었습니다.")
+                budget.mark_truncated("fetch")
+            finally:
+                spot_cursor.close()
             
             logger.info(f"Query returned {len(spots)} spots.")
             if not spots:
@@ -89,71 +142,58 @@ class TourAPIRecommender:
                     continue
 
             # 3. 클러스터링 기반 일정 최적화
-            try:
-                max_restaurants_per_day = settings.MAX_RESTAURANTS_PER_DAY
-                
-                schedule = optimize_schedule(tourist_spots + restaurants, days) or {}
-                
-            except Exception as e:
-                logger.error(f"일정 최적화 중 오류 발생: {str(e)}")
-                schedule = {}
-                spots_per_day = len(tourist_spots) // days if days > 0 else 0
-                selected_restaurants = restaurants[:max_restaurants_per_day * days]  # Select a subset of restaurants
-                for day in range(1, days + 1):
-                    day_spots = []
-                    start_idx = (day - 1) * spots_per_day
-                    end_idx = start_idx + spots_per_day if day < days else len(tourist_spots)
-                    day_spots.extend(tourist_spots[start_idx:end_idx])
-                    
-                    start_idx = (day - 1) * max_restaurants_per_day
-                    end_idx = start_idx + max_restaurants_per_day
-                    day_spots.extend(selected_restaurants[start_idx:end_idx])
-                    
-                    schedule[f"day_{day}"] = day_spots
+            schedule = optimize_schedule(tourist_spots + restaurants, days, budget) or {}
 
             # 4. 숙소 추천
             accommodations = {}
+            accommodation_deadline = budget.stage("accommodation")
+            accommodation_results = []
+            if days > 1:
+                try:
+                    set_statement_timeout(cursor, accommodation_deadline.remaining_ms())
+                    accommodation_query = get_accommodations_query()
+                    cursor.execute(accommodation_query, [area_code, sigungu_code])
+                    accommodation_results = cursor.fetchall()
+                except QueryCanceled:
+                    cursor.connection.rollback()
+                    logger.warning("숙소 조회 시간이 초과되어 숙소 추천을 생략합니다.")
+                    budget.mark_truncated("accommodation")
+
+            day_accommodations = []
+            for acc in accommodation_results:
+                try:
+                    accommodation = Accommodation(
+                        destination_id=str(acc["destination_id"]),
+                        name=acc["name"],
+                        addr1=acc["addr1"] or "",
+                        addr2=acc["addr2"],
+                        content_id=str(acc["content_id"]),
+                        latitude=float(acc["latitude"]),
+                        longitude=float(acc["longitude"])
+                    )
+                    day_accommodations.append(accommodation)
+                except (ValueError, TypeError) as e:
+                    logger.error(f"Error processing accommodation: {acc}, Error: {str(e)}")
+                    continue
+
             for day in range(1, days):
                 day_spots = schedule.get(f"day_{day}", [])
-                if not day_spots:
+                if not day_spots or not day_accommodations:
                     continue
 
                 center_lat = sum(spot.latitude for spot in day_spots) / len(day_spots)
                 center_lon = sum(spot.longitude for spot in day_spots) / len(day_spots)
 
-                accommodation_query = get_accommodations_query()
-                cursor.execute(accommodation_query, [area_code, sigungu_code])
-                accommodation_results = cursor.fetchall()
-                
-                if accommodation_results:
-                    day_accommodations = []
-                    for acc in accommodation_results:
-                        try:
-                            accommodation = Accommodation(
-                                destination_id=str(acc["destination_id"]),
-                                name=acc["name"],
-                                addr1=acc["addr1"] or "",
-                                addr2=acc["addr2"],
-                                content_id=str(acc["content_id"]),
-                                latitude=float(acc["latitude"]),
-                                longitude=float(acc["longitude"])
-                            )
-                            day_accommodations.append(accommodation)
-                        except (ValueError, TypeError) as e:
-                            logger.error(f"Error processing accommodation: {acc}, Error: {str(e)}")
-                            continue
-                    
-                    if day_accommodations:
-                        selected_accommodation = min(
-                            day_accommodations,
-                            key=lambda acc: haversine(
-                                center_lat,
-                                center_lon,
-                                float(acc.latitude),
-                                float(acc.longitude)
-                            )
-                        )
-                        accommodations[f"day_{day}"] = selected_accommodation
+                selected_accommodation = min(
+                    day_accommodations,
+                    key=lambda acc: haversine(
+                        center_lat,
+                        center_lon,
+                        float(acc.latitude),
+                        float(acc.longitude)
+                    )
+                )
+                accommodations[f"day_{day}"] = selected_accommodation
 
             # 5. 최종 일정 구성
             final_schedule = {}
@@ -167,7 +207,8 @@ class TourAPIRecommender:
             return {
                 "schedule": final_schedule,
                 "message": "여행 일정이 성공적으로 생성되었습니다.",
-                "area_code": area_code
+                "area_code": area_code,
+                "truncated_stages": budget.truncated_stages
             }
 
         except Exception as e:
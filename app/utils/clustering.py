@@ -1,17 +1,23 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from sklearn.cluster import KMeans
 from app.api.v1.schemas.recommendations import TravelSpot
 from app.utils.distance import haversine
+from app.utils.deadline import Deadline, PlanningBudget, is_expired
 from app.core.config import settings
 
-def optimize_schedule(spots: List[TravelSpot], days: int) -> Dict[str, List[TravelSpot]]:
+def optimize_schedule(
+    spots: List[TravelSpot],
+    days: int,
+    budget: Optional[PlanningBudget] = None
+) -> Dict[str, List[TravelSpot]]:
     """
     여행지를 클러스터링하여 일자별 일정을 최적화합니다.
     
     Args:
         spots: 여행지 목록
         days: 여행 일수
+        budget: 요청 단위 시간 예산 (None이면 시간 제한 없음)
         
     Returns:
         Dict[str, List[TravelSpot]]: 일자별 여행지 목록
@@ -23,32 +29,17 @@ def optimize_schedule(spots: List[TravelSpot], days: int) -> Dict[str, List[Trav
     tourist_spots = [spot for spot in spots if spot.type != "restaurant"]
     restaurants = [spot for spot in spots if spot.type == "restaurant"]
     
-    # 위도, 경도 데이터 준비 (관광지 기준으로 클러스터링)
-    X = np.array([[spot.latitude, spot.longitude] for spot in tourist_spots])
+    # 클러스터링 (시간 초과 시 현재까지의 최선 결과 사용)
+    cluster_deadline = budget.stage("clustering") if budget else None
+    cluster_spots, truncated = cluster_spots_by_day(tourist_spots, restaurants, days, cluster_deadline)
+    if truncated and budget:
+        budget.mark_truncated("clustering")
     
-    # K-means 클러스터링 수행
-    kmeans = KMeans(n_clusters=days, random_state=42)
-    clusters = kmeans.fit_predict(X)
-    centroids = kmeans.cluster_centers_  # 클러스터 중심 좌표
-    
-    # 클러스터별 여행지 그룹화
-    schedule = {f"day_{day}": [] for day in range(1, days + 1)}
-    cluster_spots = {day: [] for day in range(days)}
-    for i, spot in enumerate(tourist_spots):
-        cluster_spots[clusters[i]].append(spot)
-    
-    # 식당을 클러스터 중심과 매칭
-    for restaurant in restaurants:
-        closest_cluster = min(
-            range(days),
-            key=lambda cluster_idx: haversine(
-                centroids[cluster_idx][0], centroids[cluster_idx][1],
-                restaurant.latitude, restaurant.longitude
-            )
-        )
-        cluster_spots[closest_cluster].append(restaurant)
+    route_deadline = budget.stage("route") if budget else None
+    route_truncated = False
     
     # 클러스터별 일정 생성
+    schedule = {f"day_{day}": [] for day in range(1, days + 1)}
     for day in range(1, days + 1):
         day_spots = cluster_spots[day - 1]
         
@@ -67,30 +58,121 @@ def optimize_schedule(spots: List[TravelSpot], days: int) -> Dict[str, List[Trav
         day_restaurants = day_restaurants[:max_restaurants_per_day]
         
         # 관광지와 식당 순서 최적화
-        optimized_tourist_spots = optimize_cluster_order(day_tourist_spots)
-        optimized_restaurants = optimize_cluster_order(day_restaurants)
+        optimized_tourist_spots, tourist_truncated = improve_route(
+            optimize_cluster_order(day_tourist_spots), route_deadline
+        )
+        optimized_restaurants, restaurant_truncated = improve_route(
+            optimize_cluster_order(day_restaurants), route_deadline
+        )
+        route_truncated = route_truncated or tourist_truncated or restaurant_truncated
         
         # 관광지와 식당 번갈아 배치
-        day_schedule = []
-        tourist_index = 0
-        restaurant_index = 0
-        
-        while tourist_index < len(optimized_tourist_spots) or restaurant_index < len(optimized_restaurants):
-            # 관광지 2개 추가
-            for _ in range(2):
-                if tourist_index < len(optimized_tourist_spots):
-                    day_schedule.append(optimized_tourist_spots[tourist_index])
-                    tourist_index += 1
-                    
-            # 식당 1개 추가 (가능한 경우)
-            if restaurant_index < len(optimized_restaurants):
-                day_schedule.append(optimized_restaurants[restaurant_index])
-                restaurant_index += 1
+        schedule[f"day_{day}"] = interleave_spots(optimized_tourist_spots, optimized_restaurants)
         
-        schedule[f"day_{day}"] = day_schedule
+    if route_truncated and budget:
+        budget.mark_truncated("route")
         
     return schedule
 
+def interleave_spots(tourist_spots: List[TravelSpot], restaurants: List[TravelSpot]) -> List[TravelSpot]:
+    """
+    관광지 2곳마다 식당 1곳을 배치합니다.
+    
+    Args:
+        tourist_spots: 방문 순서대로 정렬된 관광지 목록
+        restaurants: 방문 순서대로 정렬된 식당 목록
+        
+    Returns:
+        List[TravelSpot]: 하루 일정
+    """
+    day_schedule = []
+    tourist_index = 0
+    restaurant_index = 0
+    
+    while tourist_index < len(tourist_spots) or restaurant_index < len(restaurants):
+        # 관광지 2개 추가
+        for _ in range(2):
+            if tourist_index < len(tourist_spots):
+                day_schedule.append(tourist_spots[tourist_index])
+                tourist_index += 1
+
+        # 식당 1개 추가 (가능한 경우)
+        if restaurant_index < len(restaurants):
+            day_schedule.append(restaurants[restaurant_index])
+            restaurant_index += 1
+
+    return day_schedule
+
+def cluster_spots_by_day(
+    tourist_spots: List[TravelSpot],
+    restaurants: List[TravelSpot],
+    days: int,
+    deadline: Optional[Deadline] = None
+) -> Tuple[Dict[int, List[TravelSpot]], bool]:
+    """
+    관광지를 일수만큼 클러스터링하고 식당을 가장 가까운 클러스터에 배정합니다.
+    
+    K-means를 시드를 바꿔가며 재시작하고 관성(inertia)이 가장 작은 결과를 유지합니다.
+    마감이 지나면 재시작을 멈추고, 한 번도 실행하지 못했다면 순서대로 나누어 배정합니다.
+    
+    Args:
+        tourist_spots: 관광지 목록
+        restaurants: 식당 목록
+        days: 여행 일수
+        deadline: 클러스터링 단계 마감 (None이면 시간 제한 없음)
+        
+    Returns:
+        Tuple[Dict[int, List[TravelSpot]], bool]: 클러스터 인덱스별 여행지 목록, 중간 종료 여부
+    """
+    cluster_spots = {day: [] for day in range(days)}
+    
+    # 관광지가 없으면 식당을 기준으로 클러스터링
+    anchors = tourist_spots or restaurants
+    others = restaurants if tourist_spots else []
+    if not anchors:
+        return cluster_spots, False
+    
+    # 위도, 경도 데이터 준비
+    X = np.array([[spot.latitude, spot.longitude] for spot in anchors])
+    n_clusters = min(days, len(anchors))
+    
+    truncated = False
+    best = None
+    for attempt in range(max(1, settings.CLUSTERING_MAX_RESTARTS)):
+        if is_expired(deadline):
+            truncated = True
+            break
+        # K-means 클러스터링 수행
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42 + attempt, n_init=1)
+        kmeans.fit(X)
+        if best is None or kmeans.inertia_ < best.inertia_:
+            best = kmeans
+    
+    if best is not None:
+        clusters = best.labels_
+        centroids = best.cluster_centers_  # 클러스터 중심 좌표
+    else:
+        # 예산이 없으면 입력 순서대로 균등 분할
+        clusters = np.arange(len(anchors)) * n_clusters // len(anchors)
+        centroids = np.array([X[clusters == idx].mean(axis=0) for idx in range(n_clusters)])
+    
+    # 클러스터별 여행지 그룹화
+    for i, spot in enumerate(anchors):
+        cluster_spots[clusters[i]].append(spot)
+    
+    # 식당을 클러스터 중심과 매칭
+    for restaurant in others:
+        closest_cluster = min(
+            range(n_clusters),
+            key=lambda cluster_idx: haversine(
+                centroids[cluster_idx][0], centroids[cluster_idx][1],
+                restaurant.latitude, restaurant.longitude
+            )
+        )
+        cluster_spots[closest_cluster].append(restaurant)
+        
+    return cluster_spots, truncated
+
 def optimize_cluster_order(spots: List[TravelSpot]) -> List[TravelSpot]:
     """
     클러스터 내 여행지들의 방문 순서를 최적화합니다.
@@ -122,4 +204,46 @@ def optimize_cluster_order(spots: List[TravelSpot]) -> List[TravelSpot]:
         remaining.remove(next_spot)
         current = next_spot
         
-    return optimized
\ No newline at end of file
+    return optimized
+
+def improve_route(
+    spots: List[TravelSpot],
+    deadline: Optional[Deadline] = None
+) -> Tuple[List[TravelSpot], bool]:
+    """
+    2-opt 교환으로 방문 순서의 총 이동 거리를 줄입니다.
+    
+    개선이 더 이상 없거나 마감이 지나면 현재까지의 최선 경로를 반환합니다.
+    
+    Args:
+        spots: 초기 방문 순서의 여행지 목록
+        deadline: 경로 개선 단계 마감 (None이면 시간 제한 없음)
+        
+    Returns:
+        Tuple[List[TravelSpot], bool]: 개선된 순서의 여행지 목록, 중간 종료 여부
+    """
+    route = list(spots)
+    if len(route) < 3:
+        return route, False
+    
+    def dist(a: TravelSpot, b: TravelSpot) -> float:
+        return haversine(a.latitude, a.longitude, b.latitude, b.longitude)
+    
+    # 시작점만 고정된 열린 경로이므로 마지막 여행지도 뒤집기 구간에 포함
+    last = len(route) - 1
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, last):
+            if is_expired(deadline):
+                return route, True
+            for j in range(i + 1, last + 1):
+                # (i-1, i), (j, j+1) 구간을 (i-1, j), (i, j+1)로 교체 (j가 마지막이면 (j, j+1) 구간 없음)
+                delta = dist(route[i - 1], route[j]) - dist(route[i - 1], route[i])
+                if j < last:
+                    delta += dist(route[i], route[j + 1]) - dist(route[j], route[j + 1])
+                if delta < -1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+                    
+    return route, False
\ No newline at end of file
@@ -0,0 +1,53 @@
+import time
+from typing import Dict, List, Optional
+
+class Deadline:
+    """
+    단조 시계(monotonic clock) 기반의 마감 시각입니다.
+
+    Args:
+        budget_ms: 지금부터 마감까지 남은 시간 (ms)
+    """
+    def __init__(self, budget_ms: float):
+        self.budget_ms = max(0.0, budget_ms)
+        self.expires_at = time.monotonic() + self.budget_ms / 1000
+
+    def remaining_ms(self) -> float:
+        """마감까지 남은 시간 (ms)"""
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+    def expired(self) -> bool:
+        """마감 시각이 지났는지 여부"""
+        return time.monotonic() >= self.expires_at
+
+def is_expired(deadline: Optional[Deadline]) -> bool:
+    """마감이 지정되지 않았으면 항상 False를 반환합니다."""
+    return deadline is not None and deadline.expired()
+
+class PlanningBudget:
+    """
+    요청 단위 지연 예산을 단계별로 나누어 줍니다.
+
+    각 단계는 남은 예산 중 아직 실행되지 않은 단계들의 비율 합 대비 자신의 비율만큼을 받습니다.
+    앞 단계가 일찍 끝나면 남은 시간은 뒤 단계로 넘어갑니다.
+
+    Args:
+        budget_ms: 요청 전체 예산 (ms)
+        stage_ratios: 단계 이름별 예산 비율 (예: {"fetch": 0.4, "clustering": 0.3})
+    """
+    def __init__(self, budget_ms: float, stage_ratios: Dict[str, float]):
+        self.deadline = Deadline(budget_ms)
+        self.truncated_stages: List[str] = []
+        self._pending = dict(stage_ratios)
+
+    def stage(self, name: str) -> Deadline:
+        """단계 시작 시점에 해당 단계의 마감을 발급합니다."""
+        ratio = self._pending.pop(name, 0.0)
+        total = ratio + sum(self._pending.values())
+        share = ratio / total if total > 0 else 1.0
+        return Deadline(self.deadline.remaining_ms() * share)
+
+    def mark_truncated(self, name: str) -> None:
+        """시간 초과로 중간 결과를 반환한 단계를 기록합니다."""
+        if name not in self.truncated_stages:
+            self.truncated_stages.append(name)
@@ -1,4 +1,5 @@
 from math import radians, sin, cos, sqrt, atan2
+import numpy as np
 
 def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -29,4 +30,27 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     # 거리 계산 (km)
     distance = R * c
     
-    return distance 
\ No newline at end of file
+    return distance
+
+def haversine_many(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    한 지점에서 여러 지점까지의 거리를 한 번에 계산합니다 (haversine의 벡터 버전).
+    
+    Args:
+        lat: 기준 지점의 위도
+        lon: 기준 지점의 경도
+        lats: 대상 지점들의 위도 배열
+        lons: 대상 지점들의 경도 배열
+        
+    Returns:
+        np.ndarray: 기준 지점에서 각 지점까지의 거리 (km)
+    """
+    R = 6371  # 지구의 반경 (km)
+    
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return R * c
\ No newline at end of file
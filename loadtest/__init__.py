@@ -0,0 +1,3 @@
+"""
+동시성 부하 테스트 도구
+"""
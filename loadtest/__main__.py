@@ -0,0 +1,350 @@
+"""
+FastAPI 앱 동시성 부하 테스트
+
+로컬 Postgres에 합성 TourAPI 데이터베이스를 만든 뒤, 동시성 수준을 높여가며
+/api/v1/recommendations/ 와 /api/v1/recommendations/categories/{code} 요청을 섞어 보내고
+처리량, 지연 백분위수, 이벤트 루프 지연, DB 연결 수를 보고합니다.
+
+실행:
+    python -m loadtest --concurrency 1,4,16,64 --requests 400
+    python -m loadtest --url http://127.0.0.1:8000 --skip-seed   # 로컬 uvicorn 대상
+
+DB 접속 정보는 앱과 같은 DB_HOST / DB_PORT / DB_USER / DB_PASSWORD 설정을 사용하고,
+데이터베이스 이름만 --db-name으로 바꿉니다.
+데이터베이스를 지우고 다시 만들기 때문에 DB_HOST가 로컬(localhost, 127.0.0.1, 소켓)이 아니면
+--allow-remote 없이는 실행하지 않으며, 앱에 설정된 DB_NAME과 같은 이름은 거부합니다.
+--url 모드에서는 서버가 같은 데이터베이스(DB_NAME)를 바라보도록 따로 실행해야 하며,
+사전 계산 사용 여부도 서버 설정을 따르므로 --precomputed와 함께 쓸 수 없습니다.
+이벤트 루프 지연은 인프로세스 모드에서만 보고합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+API_PREFIX = "/api/v1/recommendations"
+LOCAL_DB_HOSTS = ("localhost", "127.0.0.1", "::1", "")
+CATEGORY_CODES = ["A01", "A02", "A03", "A04", "A05"]
+HIERARCHY_CODES = ["A01", "A02", "A03", "A04", "A05", "B02", "A0101", "A0201", "A0502"]
+
+@dataclass
+class RunResult:
+    concurrency: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    loop_lags: List[float] = field(default_factory=list)
+    peak_connections: int = 0
+
+def percentile(values: List[float], pct: float) -> float:
+    """최근접 순위(nearest-rank) 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def build_request_mix(
+    regions: List[Tuple[str, str]],
+    count: int,
+    recommendation_ratio: float,
+    rng: random.Random
+) -> List[Tuple[str, str, Optional[Dict]]]:
+    """(method, path, body) 목록을 생성합니다. 추천 요청의 일수는 2~3일에 몰리도록 합니다."""
+    requests = []
+    for _ in range(count):
+        if rng.random() < recommendation_ratio:
+            area_code, sigungu_code = rng.choice(regions)
+            body = {
+                "area_code": area_code,
+                # 일부 요청은 시군구 없이 지역 전체 대상
+                "sigungu_code": sigungu_code if rng.random() < 0.9 else "",
+                "category_codes": rng.sample(CATEGORY_CODES, rng.choice([2, 2, 3])),
+                "days": rng.choices(range(1, 8), weights=[2, 5, 5, 3, 1, 1, 1])[0],
+            }
+            requests.append(("POST", f"{API_PREFIX}/", body))
+        else:
+            requests.append(("GET", f"{API_PREFIX}/categories/{rng.choice(HIERARCHY_CODES)}", None))
+    return requests
+
+async def asgi_request(app, method: str, path: str, body: Optional[Dict]) -> int:
+    """httpx 없이 ASGI 앱을 직접 호출하고 응답 상태 코드를 반환합니다."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"loadtest"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    body_sent = False
+    response_done = asyncio.Event()
+    status = 0
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    await app(scope, receive, send)
+    return status
+
+def http_request(base_url: str, method: str, path: str, body: Optional[Dict]) -> int:
+    """실행 중인 서버에 동기 HTTP 요청을 보냅니다 (스레드에서 호출)."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(
+        base_url.rstrip("/") + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+class ConnectionSampler(threading.Thread):
+    """pg_stat_activity를 주기적으로 조회해 대상 DB의 최대 연결 수를 기록합니다."""
+    def __init__(self, connect: Callable, db_name: str, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.connect = connect
+        self.db_name = db_name
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        conn = self.connect()
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                while not self.stop_event.is_set():
+                    cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = %s", (self.db_name,))
+                    # 샘플러 자신의 연결은 제외
+                    self.peak = max(self.peak, list(cursor.fetchone().values())[0] - 1)
+                    self.stop_event.wait(self.interval)
+        finally:
+            conn.close()
+
+async def monitor_loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.01) -> None:
+    """sleep이 예정보다 늦게 깨어난 시간을 이벤트 루프 지연으로 기록합니다."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - started - interval))
+
+async def run_level(
+    send_request: Callable,
+    requests: List[Tuple[str, str, Optional[Dict]]],
+    concurrency: int,
+    sampler: Optional[ConnectionSampler]
+) -> RunResult:
+    """동시 작업자 concurrency개가 요청 목록을 나눠 처리합니다."""
+    result = RunResult(concurrency=concurrency, elapsed=0.0)
+    queue = iter(requests)
+    stop = asyncio.Event()
+
+    async def worker():
+        for method, path, body in queue:
+            started = time.perf_counter()
+            try:
+                status = await send_request(method, path, body)
+            except Exception:
+                status = 0
+            result.latencies.append(time.perf_counter() - started)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+
+    lag_task = asyncio.create_task(monitor_loop_lag(result.loop_lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    stop.set()
+    await lag_task
+    if sampler is not None:
+        result.peak_connections = sampler.peak
+        sampler.peak = 0
+    return result
+
+def print_report(results: List[RunResult], show_loop_lag: bool = True) -> None:
+    """
+    동시성 수준별 결과를 표로 출력합니다.
+
+    Args:
+        results: 동시성 수준별 측정 결과
+        show_loop_lag: 이벤트 루프 지연 열 출력 여부 (서버 모드에서는 클라이언트 루프라 의미 없음)
+    """
+    lag_header = f" {'lag p99':>8} {'lag max':>8}" if show_loop_lag else ""
+    header = (
+        f"{'conc':>5} {'reqs':>6} {'ok':>6} {'4xx':>5} {'5xx/err':>7} {'rps':>8} "
+        f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}{lag_header} {'db conn':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        total = len(r.latencies)
+        ok = sum(count for status, count in r.statuses.items() if 200 <= status < 300)
+        client_errors = sum(count for status, count in r.statuses.items() if 400 <= status < 500)
+        ms = [latency * 1000 for latency in r.latencies]
+        lags = [lag * 1000 for lag in r.loop_lags]
+        lag_columns = f" {percentile(lags, 99):>8.1f} {max(lags, default=0):>8.1f}" if show_loop_lag else ""
+        print(
+            f"{r.concurrency:>5} {total:>6} {ok:>6} {client_errors:>5} {total - ok - client_errors:>7} "
+            f"{total / r.elapsed if r.elapsed else 0:>8.1f} "
+            f"{percentile(ms, 50):>8.1f} {percentile(ms, 90):>8.1f} {percentile(ms, 99):>8.1f} "
+            f"{max(ms, default=0):>8.1f}{lag_columns} "
+            f"{r.peak_connections:>7}"
+        )
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FastAPI 앱 동시성 부하 테스트")
+    parser.add_argument("--db-name", default="travelai_loadtest", help="부하 테스트용 데이터베이스 이름")
+    parser.add_argument("--skip-seed", action="store_true", help="기존 데이터베이스를 그대로 사용")
+    parser.add_argument("--areas", type=int, default=4, help="합성 지역 수")
+    parser.add_argument("--sigungu", type=int, default=5, help="지역당 시군구 수")
+    parser.add_argument("--destinations", type=int, default=300, help="시군구당 여행지 수")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="쉼표로 구분한 동시성 수준")
+    parser.add_argument("--requests", type=int, default=200, help="동시성 수준별 요청 수")
+    parser.add_argument("--recommendation-ratio", type=float, default=0.85, help="추천 요청 비율 (나머지는 카테고리 조회)")
+    parser.add_argument("--warmup", type=int, default=10, help="측정 전 예열 요청 수")
+    parser.add_argument("--precomputed", action="store_true", help="사전 계산 결과를 만들어 온라인 경로에서 사용")
+    parser.add_argument("--url", default=None, help="인프로세스 대신 실행 중인 서버(예: http://127.0.0.1:8000)로 요청")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--log-level", default="WARNING", help="앱 로그 레벨 (.env의 LOG_LEVEL보다 우선)")
+    parser.add_argument("--allow-remote", action="store_true", help="로컬이 아닌 DB_HOST에도 실행 허용")
+    args = parser.parse_args()
+
+    if args.precomputed and args.url:
+        parser.error("--precomputed는 --url과 함께 쓸 수 없습니다 (외부 서버는 임시 사전 계산 디렉토리를 읽지 않음)")
+
+    # 앱 설정과 같은 방식으로 .env를 읽어, DB_NAME을 덮어쓰기 전의 원래 대상 확인
+    load_dotenv()
+    db_host = os.getenv("DB_HOST", "localhost")
+    configured_db_name = os.getenv("DB_NAME", "travelai_db")
+    if db_host not in LOCAL_DB_HOSTS and not db_host.startswith("/") and not args.allow_remote:
+        parser.error(f"DB_HOST={db_host}는 로컬이 아닙니다. 원격 서버에서 실행하려면 --allow-remote를 지정하세요")
+    if args.db_name == configured_db_name:
+        parser.error(f"--db-name이 앱의 DB_NAME({configured_db_name})과 같습니다. 별도의 이름을 지정하세요")
+    return args
+
+def run(args: argparse.Namespace) -> None:
+    """데이터 준비부터 보고서 출력까지 부하 테스트를 실행합니다."""
+    from app.core.database import get_db_connection
+    from loadtest.seed import recreate_database, seed_database
+
+    if args.skip_seed:
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT DISTINCT area_code, sigungu_code FROM address WHERE sigungu_code IS NOT NULL")
+                regions = [(row["area_code"], row["sigungu_code"]) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    else:
+        recreate_database(args.db_name)
+        regions = seed_database(args.db_name, args.areas, args.sigungu, args.destinations, args.seed)
+
+    if args.precomputed:
+        from app.services.precompute import precompute_all
+        print(f"Precomputed {precompute_all()} region artifacts into {os.environ['PRECOMPUTE_DIR']}")
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    rng = random.Random(args.seed)
+
+    executor = None
+    if args.url:
+        executor = ThreadPoolExecutor(max_workers=max(levels))
+
+        async def send_request(method, path, body):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, http_request, args.url, method, path, body)
+    else:
+        from app.main import app
+
+        async def send_request(method, path, body):
+            return await asgi_request(app, method, path, body)
+
+    async def run_all() -> List[RunResult]:
+        sampler = ConnectionSampler(get_db_connection, args.db_name)
+        sampler.start()
+        try:
+            warmup = build_request_mix(regions, args.warmup, args.recommendation_ratio, rng)
+            await run_level(send_request, warmup, 1, None)
+            results = []
+            for level in levels:
+                sampler.peak = 0
+                requests = build_request_mix(regions, args.requests, args.recommendation_ratio, rng)
+                results.append(await run_level(send_request, requests, level, sampler))
+            return results
+        finally:
+            sampler.stop_event.set()
+            sampler.join()
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    mode = f"server {args.url}" if args.url else "in-process ASGI"
+    print(f"\nMode: {mode}, regions: {len(regions)}, requests per level: {args.requests}\n")
+    print_report(results, show_loop_lag=not args.url)
+
+def main() -> None:
+    args = parse_args()
+
+    # app 설정은 import 시점에 환경 변수에서 읽으므로 먼저 지정
+    # (.env의 LOG_LEVEL=INFO는 요청마다 SQL을 기록해 측정 대상 이벤트 루프를 느리게 하므로 덮어씀)
+    os.environ["DB_NAME"] = args.db_name
+    os.environ["LOG_LEVEL"] = args.log_level
+    precompute_dir = None
+    if args.precomputed:
+        precompute_dir = tempfile.mkdtemp(prefix="travelai_precomputed_")
+        os.environ["PRECOMPUTE_DIR"] = precompute_dir
+    else:
+        os.environ["PRECOMPUTE_ENABLED"] = "false"
+
+    try:
+        run(args)
+    finally:
+        if precompute_dir is not None:
+            shutil.rmtree(precompute_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
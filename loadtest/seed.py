@@ -0,0 +1,211 @@
+"""
+부하 테스트용 로컬 데이터베이스 생성 및 합성 데이터 적재
+
+TourAPI 형태의 category / address / destination 테이블을 만들고
+지역·시군구별로 관광지, 음식점, 숙소를 무작위로 흩뿌립니다.
+"""
+
+import logging
+import random
+from typing import Dict, List, Tuple
+import psycopg2
+from psycopg2.extras import execute_values
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+    DROP TABLE IF EXISTS destination;
+    DROP TABLE IF EXISTS address;
+    DROP TABLE IF EXISTS category;
+
+    CREATE TABLE category (
+        category_id SERIAL PRIMARY KEY,
+        category_code VARCHAR(16) NOT NULL UNIQUE,
+        name VARCHAR(100) NOT NULL,
+        parent_id INTEGER REFERENCES category(category_id)
+    );
+
+    CREATE TABLE address (
+        address_id SERIAL PRIMARY KEY,
+        area_code VARCHAR(8) NOT NULL,
+        sigungu_code VARCHAR(8)
+    );
+
+    CREATE TABLE destination (
+        destination_id SERIAL PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        addr1 VARCHAR(300),
+        addr2 VARCHAR(300),
+        latitude NUMERIC(10, 7),
+        longitude NUMERIC(10, 7),
+        content_id VARCHAR(20),
+        category_id INTEGER NOT NULL REFERENCES category(category_id),
+        address_id INTEGER NOT NULL REFERENCES address(address_id)
+    );
+
+    CREATE INDEX idx_address_area_sigungu ON address(area_code, sigungu_code);
+    CREATE INDEX idx_destination_address ON destination(address_id);
+    CREATE INDEX idx_destination_category ON destination(category_id);
+    CREATE INDEX idx_category_parent ON category(parent_id);
+"""
+
+# 대분류(cat1) -> 중분류(cat2) -> 소분류(cat3)
+CATEGORY_TREE: Dict[str, Tuple[str, Dict[str, Tuple[str, List[Tuple[str, str]]]]]] = {
+    "A01": ("자연", {
+        "A0101": ("자연관광지", [("A01010100", "국립공원"), ("A01010400", "산"), ("A01011200", "해수욕장")]),
+        "A0102": ("관광자원", [("A01020100", "희귀동.식물"), ("A01020200", "기암괴석")]),
+    }),
+    "A02": ("인문(문화/예술/역사)", {
+        "A0201": ("역사관광지", [("A02010100", "고궁"), ("A02010800", "사찰")]),
+        "A0202": ("휴양관광지", [("A02020200", "관광단지"), ("A02020700", "공원")]),
+        "A0206": ("문화시설", [("A02060100", "박물관"), ("A02060500", "미술관")]),
+    }),
+    "A03": ("레포츠", {
+        "A0302": ("육상 레포츠", [("A03020200", "수련시설"), ("A03020700", "골프")]),
+        "A0303": ("수상 레포츠", [("A03030100", "윈드서핑"), ("A03030600", "요트")]),
+    }),
+    "A04": ("쇼핑", {
+        "A0401": ("쇼핑", [("A04010100", "5일장"), ("A04010200", "상설시장")]),
+    }),
+    "A05": ("음식", {
+        "A0502": ("음식점", [
+            ("A05020100", "한식"), ("A05020200", "서양식"), ("A05020300", "일식"),
+            ("A05020400", "중식"), ("A05020900", "카페/전통찻집"), ("A05021000", "클럽"),
+        ]),
+    }),
+    "B02": ("숙박", {
+        "B0201": ("숙박시설", [("B02010100", "관광호텔"), ("B02010700", "펜션"), ("B02011100", "게스트하우스")]),
+    }),
+}
+
+# 여행지 유형별 비율 (관광지 / 음식점 / 숙소)
+KIND_WEIGHTS = {"tourist": 0.55, "restaurant": 0.3, "accommodation": 0.15}
+
+def recreate_database(db_name: str) -> None:
+    """관리용 postgres 데이터베이스에 접속해 부하 테스트용 데이터베이스를 새로 만듭니다."""
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database="postgres",
+    )
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{db_name}"')
+            cursor.execute(f'CREATE DATABASE "{db_name}"')
+    finally:
+        conn.close()
+
+def _insert_categories(cursor) -> Dict[str, List[int]]:
+    """카테고리 트리를 넣고 유형별 소분류 category_id 목록을 반환합니다."""
+    leaves = {kind: [] for kind in KIND_WEIGHTS}
+    for cat1, (cat1_name, children) in CATEGORY_TREE.items():
+        cursor.execute(
+            "INSERT INTO category (category_code, name) VALUES (%s, %s) RETURNING category_id",
+            (cat1, cat1_name)
+        )
+        cat1_id = cursor.fetchone()[0]
+        for cat2, (cat2_name, cat3_list) in children.items():
+            cursor.execute(
+                "INSERT INTO category (category_code, name, parent_id) VALUES (%s, %s, %s) RETURNING category_id",
+                (cat2, cat2_name, cat1_id)
+            )
+            cat2_id = cursor.fetchone()[0]
+            for cat3, cat3_name in cat3_list:
+                cursor.execute(
+                    "INSERT INTO category (category_code, name, parent_id) VALUES (%s, %s, %s) RETURNING category_id",
+                    (cat3, cat3_name, cat2_id)
+                )
+                cat3_id = cursor.fetchone()[0]
+                if cat1 == "B02":
+                    leaves["accommodation"].append(cat3_id)
+                elif cat1 == "A05":
+                    leaves["restaurant"].append(cat3_id)
+                else:
+                    leaves["tourist"].append(cat3_id)
+    return leaves
+
+def seed_database(
+    db_name: str,
+    areas: int = 4,
+    sigungu_per_area: int = 5,
+    destinations_per_sigungu: int = 300,
+    seed: int = 42
+) -> List[Tuple[str, str]]:
+    """
+    합성 데이터를 적재합니다.
+
+    Args:
+        db_name: 대상 데이터베이스 이름
+        areas: 지역 수
+        sigungu_per_area: 지역당 시군구 수
+        destinations_per_sigungu: 시군구당 여행지 수
+        seed: 난수 시드
+
+    Returns:
+        List[Tuple[str, str]]: 생성된 (area_code, sigungu_code) 목록
+    """
+    rng = random.Random(seed)
+    conn = psycopg2.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=db_name,
+    )
+    regions = []
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(SCHEMA)
+            leaves = _insert_categories(cursor)
+            kinds = list(KIND_WEIGHTS)
+            weights = [KIND_WEIGHTS[kind] for kind in kinds]
+            content_id = 100000
+
+            for area in range(1, areas + 1):
+                # 한반도 범위 안에서 지역 중심 선택
+                area_lat, area_lon = rng.uniform(34.5, 37.8), rng.uniform(126.5, 129.2)
+                for sigungu in range(1, sigungu_per_area + 1):
+                    area_code, sigungu_code = str(area), str(sigungu)
+                    cursor.execute(
+                        "INSERT INTO address (area_code, sigungu_code) VALUES (%s, %s) RETURNING address_id",
+                        (area_code, sigungu_code)
+                    )
+                    address_id = cursor.fetchone()[0]
+                    center_lat = area_lat + rng.uniform(-0.3, 0.3)
+                    center_lon = area_lon + rng.uniform(-0.3, 0.3)
+
+                    rows = []
+                    for i in range(destinations_per_sigungu):
+                        kind = rng.choices(kinds, weights)[0]
+                        content_id += 1
+                        rows.append((
+                            f"{kind}-{area_code}-{sigungu_code}-{i}",
+                            f"합성 주소 {area_code}-{sigungu_code} {i}번길",
+                            None,
+                            round(rng.gauss(center_lat, 0.05), 7),
+                            round(rng.gauss(center_lon, 0.05), 7),
+                            str(content_id),
+                            rng.choice(leaves[kind]),
+                            address_id,
+                        ))
+                    execute_values(
+                        cursor,
+                        """
+                        INSERT INTO destination
+                            (name, addr1, addr2, latitude, longitude, content_id, category_id, address_id)
+                        VALUES %s
+                        """,
+                        rows
+                    )
+                    regions.append((area_code, sigungu_code))
+            cursor.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    logger.info(f"Seeded {len(regions)} regions x {destinations_per_sigungu} destinations into {db_name}")
+    return regions